@@ -0,0 +1,164 @@
+"""
+Admission Control for /api/analyze
+Every agent run holds a server thread for its full duration, so requests are
+admitted through per-agent_type lanes with concurrency limits, bounded wait
+queues and priorities, plus a per-client token bucket. Requests that cannot be
+served soon are rejected immediately so the caller can retry later.
+"""
+
+import itertools
+import math
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is rate limited or its lane has no room"""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+@dataclass
+class LaneConfig:
+    priority: int          # lower value is served first
+    max_concurrent: int
+    max_queue: int
+    max_wait: float        # seconds a request may wait for a slot
+
+
+class _LaneStats:
+    def __init__(self):
+        self.in_flight = 0
+        self.queued = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.avg_service = 1.0
+
+    def snapshot(self) -> dict:
+        return {
+            'in_flight': self.in_flight,
+            'queue_depth': self.queued,
+            'admitted': self.admitted,
+            'rejected': self.rejected,
+            'avg_wait_ms': round(self.total_wait / max(self.admitted, 1) * 1000, 1),
+            'max_wait_ms': round(self.max_wait * 1000, 1),
+            'avg_service_ms': round(self.avg_service * 1000, 1),
+        }
+
+
+class ClientRateLimiter:
+    """Token bucket per client: `rate` requests per second with bursts up to `burst`"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._buckets: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, client_id: str):
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._buckets.get(client_id, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - last) * self.rate)
+            if tokens < 1:
+                self._buckets[client_id] = (tokens, now)
+                raise AdmissionRejected("Rate limit exceeded", math.ceil((1 - tokens) / self.rate))
+            self._buckets[client_id] = (tokens - 1, now)
+
+            # Drop idle clients whose buckets have fully refilled
+            if len(self._buckets) > 10000:
+                idle = self.burst / self.rate
+                self._buckets = {cid: b for cid, b in self._buckets.items() if now - b[1] < idle}
+
+
+class AdmissionController:
+    """Priority lanes sharing a global pool of agent slots"""
+
+    def __init__(self, lanes: Dict[str, LaneConfig], max_concurrent: int, default_lane: str):
+        self.lanes = lanes
+        self.max_concurrent = max_concurrent
+        self.default_lane = default_lane
+        self.stats = {name: _LaneStats() for name in lanes}
+        self._in_flight = 0
+        self._waiters = []
+        self._sequence = itertools.count()
+        self._cond = threading.Condition()
+
+    def _lane_has_capacity(self, lane: str) -> bool:
+        return self.stats[lane].in_flight < self.lanes[lane].max_concurrent
+
+    def _next_eligible(self):
+        if self._in_flight >= self.max_concurrent:
+            return None
+        for ticket in sorted(self._waiters):
+            if self._lane_has_capacity(ticket[2]):
+                return ticket
+        return None
+
+    def _retry_after(self, lane: str) -> int:
+        stats = self.stats[lane]
+        backlog = stats.queued + stats.in_flight
+        return max(1, math.ceil(stats.avg_service * backlog / self.lanes[lane].max_concurrent))
+
+    @contextmanager
+    def admit(self, lane: str):
+        lane = lane if lane in self.lanes else self.default_lane
+        config, stats = self.lanes[lane], self.stats[lane]
+        enqueued = time.monotonic()
+
+        with self._cond:
+            ticket = (config.priority, next(self._sequence), lane)
+            self._waiters.append(ticket)
+            # Only requests that would actually wait count against the queue bound
+            if self._next_eligible() != ticket and stats.queued >= config.max_queue:
+                self._waiters.remove(ticket)
+                stats.rejected += 1
+                raise AdmissionRejected(f"{lane} queue is full", self._retry_after(lane))
+
+            stats.queued += 1
+            try:
+                deadline = enqueued + config.max_wait
+                while self._next_eligible() != ticket:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        stats.rejected += 1
+                        raise AdmissionRejected(f"{lane} queue wait exceeded", self._retry_after(lane))
+                    self._cond.wait(remaining)
+            finally:
+                self._waiters.remove(ticket)
+                stats.queued -= 1
+                # Our departure may make another waiter eligible
+                self._cond.notify_all()
+
+            waited = time.monotonic() - enqueued
+            self._in_flight += 1
+            stats.in_flight += 1
+            stats.admitted += 1
+            stats.total_wait += waited
+            stats.max_wait = max(stats.max_wait, waited)
+
+        started = time.monotonic()
+        try:
+            yield waited
+        finally:
+            with self._cond:
+                self._in_flight -= 1
+                stats.in_flight -= 1
+                stats.avg_service = 0.8 * stats.avg_service + 0.2 * (time.monotonic() - started)
+                self._cond.notify_all()
+
+    def metrics(self) -> dict:
+        with self._cond:
+            return {
+                'in_flight': self._in_flight,
+                'max_concurrent': self.max_concurrent,
+                'lanes': {name: stats.snapshot() for name, stats in self.stats.items()},
+            }
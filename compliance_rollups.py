@@ -0,0 +1,264 @@
+"""
+Compliance Rollups - incrementally maintained audit aggregates
+Transaction and violation counts are kept per regulation framework, rule,
+business unit and day. Each day and each month is stored as its own compact
+partition so a quarter-level audit merges a handful of precomputed files
+instead of rescanning raw transactions.
+"""
+
+import fcntl
+import json
+import logging
+import os
+import re
+import tempfile
+import zlib
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_DIR = os.environ.get("COMPLIANCE_ROLLUP_DIR", "rollups")
+
+# (regulation_framework, rule, business_unit) -> [transactions, violations]
+RollupKey = Tuple[str, str, str]
+Rollup = Dict[RollupKey, List[int]]
+# regulation_framework -> ISO days with data
+Coverage = Dict[str, Set[str]]
+
+
+def _to_day(value) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.fromisoformat(str(value)[:10]).date()
+
+
+def _month_end(day: date) -> date:
+    next_month = (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return next_month - timedelta(days=1)
+
+
+def parse_period(period: str) -> Tuple[date, date]:
+    """Parse 'Q3 2025', '2025-Q3', '2025-07', '2025' or 'YYYY-MM-DD..YYYY-MM-DD'"""
+    text = period.strip().upper()
+
+    match = re.fullmatch(r"Q([1-4])\s*[- ]?\s*(\d{4})|(\d{4})\s*[- ]?\s*Q([1-4])", text)
+    if match:
+        quarter = int(match.group(1) or match.group(4))
+        year = int(match.group(2) or match.group(3))
+        start = date(year, 3 * quarter - 2, 1)
+        return start, _month_end(date(year, 3 * quarter, 1))
+
+    match = re.fullmatch(r"(\d{4}-\d{2}-\d{2})\s*\.\.\s*(\d{4}-\d{2}-\d{2})", text)
+    if match:
+        start, end = _to_day(match.group(1)), _to_day(match.group(2))
+        if end < start:
+            raise ValueError(f"Compliance period ends before it starts: {period!r}")
+        return start, end
+
+    match = re.fullmatch(r"(\d{4})-(\d{2})", text)
+    if match:
+        start = date(int(match.group(1)), int(match.group(2)), 1)
+        return start, _month_end(start)
+
+    match = re.fullmatch(r"(\d{4})", text)
+    if match:
+        year = int(match.group(1))
+        return date(year, 1, 1), date(year, 12, 31)
+
+    raise ValueError(f"Unrecognized compliance period: {period!r}")
+
+
+def _merge_into(target: Rollup, source: Rollup):
+    for key, (transactions, violations) in source.items():
+        counts = target.setdefault(key, [0, 0])
+        counts[0] += transactions
+        counts[1] += violations
+
+
+def _merge_coverage(target: Coverage, source: Coverage):
+    for framework, days in source.items():
+        target.setdefault(framework, set()).update(days)
+
+
+def _parse_record(index: int, record) -> Tuple[date, RollupKey, int, int]:
+    if not isinstance(record, dict):
+        raise ValueError(f"Record {index}: expected an object")
+    when = record.get("date") or record.get("timestamp")
+    if not when:
+        raise ValueError(f"Record {index}: date or timestamp is required")
+    try:
+        day = _to_day(when)
+        transactions = int(record.get("transactions", 1))
+        violations = record.get("violations")
+        violations = int(violations) if violations is not None else (1 if record.get("violation") else 0)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Record {index}: {e}")
+    if transactions < 0 or violations < 0 or violations > transactions:
+        raise ValueError(f"Record {index}: counts must satisfy 0 <= violations <= transactions")
+    key = (
+        str(record.get("regulation_framework") or record.get("framework", "UNSPECIFIED")).upper(),
+        str(record.get("rule", "general")),
+        str(record.get("business_unit", "unassigned")),
+    )
+    return day, key, transactions, violations
+
+
+class ComplianceRollupStore:
+    """Day and month partitions of compliance counts, updated incrementally"""
+
+    def __init__(self, root: str = ROLLUP_DIR):
+        self.root = os.path.abspath(root)
+        os.makedirs(os.path.join(self.root, "day"), exist_ok=True)
+        os.makedirs(os.path.join(self.root, "month"), exist_ok=True)
+
+    # Partition storage: zlib-compressed JSON with rows of [framework, rule, unit, txns, violations]
+    # and, per framework, the days that have data
+    def _path(self, grain: str, name: str) -> str:
+        return os.path.join(self.root, grain, f"{name}.rollup")
+
+    def _load(self, grain: str, name: str) -> Optional[Tuple[Rollup, Coverage]]:
+        try:
+            with open(self._path(grain, name), "rb") as f:
+                payload = json.loads(zlib.decompress(f.read()))
+        except FileNotFoundError:
+            return None
+        rollup = {(fw, rule, unit): [txns, violations] for fw, rule, unit, txns, violations in payload["rows"]}
+        coverage = {fw: set(days) for fw, days in payload["days"].items()}
+        return rollup, coverage
+
+    def _save(self, grain: str, name: str, rollup: Rollup, coverage: Coverage):
+        payload = {
+            "rows": [[*key, counts[0], counts[1]] for key, counts in sorted(rollup.items())],
+            "days": {fw: sorted(days) for fw, days in sorted(coverage.items())},
+        }
+        path = self._path(grain, name)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(zlib.compress(json.dumps(payload, separators=(",", ":")).encode()))
+        # Atomic rename: readers never see a partially written partition
+        os.replace(tmp_path, path)
+
+    @contextmanager
+    def _locked(self, grain: str, name: str):
+        """Exclusive lock on one partition, held across threads and worker processes"""
+        fd = os.open(f"{self._path(grain, name)}.lock", os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+    def _update(self, grain: str, name: str, delta: Rollup, coverage: Coverage):
+        with self._locked(grain, name):
+            rollup, existing = self._load(grain, name) or ({}, {})
+            _merge_into(rollup, delta)
+            _merge_coverage(existing, coverage)
+            self._save(grain, name, rollup, existing)
+
+    def ingest(self, records: Iterable[dict]) -> int:
+        """Fold new records into the affected day and month partitions only.
+
+        Every record is validated before any partition is written; invalid
+        input raises ValueError.
+        """
+        day_deltas: Dict[date, Rollup] = defaultdict(dict)
+
+        for index, record in enumerate(records):
+            day, key, transactions, violations = _parse_record(index, record)
+            counts = day_deltas[day].setdefault(key, [0, 0])
+            counts[0] += transactions
+            counts[1] += violations
+
+        month_deltas: Dict[str, Rollup] = defaultdict(dict)
+        month_coverage: Dict[str, Coverage] = defaultdict(dict)
+        for day, delta in day_deltas.items():
+            month = day.strftime("%Y-%m")
+            day_coverage = {key[0]: {day.isoformat()} for key in delta}
+            self._update("day", day.isoformat(), delta, day_coverage)
+            _merge_into(month_deltas[month], delta)
+            _merge_coverage(month_coverage[month], day_coverage)
+
+        for month, delta in month_deltas.items():
+            self._update("month", month, delta, month_coverage[month])
+
+        updated = len(day_deltas) + len(month_deltas)
+        logger.info(f"📦 Compliance rollups: {updated} partitions updated")
+        return updated
+
+    def aggregate(self, start: date, end: date) -> Tuple[Rollup, Coverage]:
+        """Merge whole-month partitions plus day partitions for partial months.
+
+        Returns the merged rollup and, per framework, the days in range that have data.
+        """
+        merged: Rollup = {}
+        coverage: Coverage = {}
+
+        month_start = start.replace(day=1)
+        while month_start <= end:
+            month_end = _month_end(month_start)
+            month = self._load("month", month_start.strftime("%Y-%m"))
+
+            if month is not None and start <= month_start and month_end <= end:
+                _merge_into(merged, month[0])
+                _merge_coverage(coverage, month[1])
+            elif month is not None:
+                day = max(start, month_start)
+                while day <= min(end, month_end):
+                    partition = self._load("day", day.isoformat())
+                    if partition is not None:
+                        _merge_into(merged, partition[0])
+                        _merge_coverage(coverage, partition[1])
+                    day += timedelta(days=1)
+
+            month_start = month_end + timedelta(days=1)
+
+        return merged, coverage
+
+    def report(self, regulation_framework: str, period: str) -> dict:
+        """Build ComplianceReport fields for a framework ('ALL' for every framework) and period"""
+        start, end = parse_period(period)
+        merged, coverage = self.aggregate(start, end)
+
+        framework = regulation_framework.strip().upper()
+        if framework == "ALL":
+            covered_days = set().union(*coverage.values())
+        else:
+            merged = {key: counts for key, counts in merged.items() if key[0] == framework}
+            covered_days = coverage.get(framework, set())
+        missing_days = (end - start).days + 1 - len(covered_days)
+
+        transactions = sum(counts[0] for counts in merged.values())
+        violations = sum(counts[1] for counts in merged.values())
+        score = max(0, 100 - (violations / max(transactions, 1) * 100))
+
+        by_rule = sorted(
+            ((key, counts) for key, counts in merged.items() if counts[1] > 0),
+            key=lambda item: item[1][1],
+            reverse=True,
+        )
+        violations_detected = [
+            f"{fw} {rule} ({unit}): {counts[1]:,} violations in {counts[0]:,} transactions"
+            for (fw, rule, unit), counts in by_rule
+        ]
+        remediation_steps = [
+            f"Remediate {fw} {rule} controls in {unit}"
+            for (fw, rule, unit), _ in by_rule[:5]
+        ]
+        if missing_days:
+            remediation_steps.append(f"Backfill compliance data for {missing_days} day(s) missing from {period}")
+
+        return {
+            "regulation_framework": f"{regulation_framework} {period}",
+            "compliance_score": int(score),
+            "violations_detected": violations_detected,
+            "remediation_steps": remediation_steps,
+            "audit_trail_complete": missing_days == 0 and transactions > 0,
+            "transactions_reviewed": transactions,
+            "violations": violations,
+        }
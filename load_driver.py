@@ -0,0 +1,189 @@
+"""
+Local Load Driver for the Enterprise Financial AI Platform
+Fires a mix of agent queries at a running server and reports status codes,
+latency and the server's admission metrics per agent_type.
+
+    python load_driver.py --mix fraud_detection=20,compliance=60 --concurrency 40
+
+With --bench-tools it instead benchmarks chat-only streams running alongside
+CPU-heavy tool calls, once inline and once through the process pool.
+
+    python load_driver.py --bench-tools --chat-streams 20 --tool-calls 4
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter, defaultdict
+
+# Open-ended queries the fast path does not answer, so every request goes through admission control
+QUERIES = {
+    "fraud_detection": "Analyze: TXN-001: $15,234 to OVERSEAS-ELECTRONICS, TXN-002: $45,000 to CRYPTO-EXCHANGE",
+    "compliance": "Explain the root causes of our 5 PCI-DSS violations in Q3 2025 and who should own remediation",
+    "risk_analysis": "How would a 2008-style crisis affect our $2.5B portfolio of 60% equities and 30% bonds?",
+}
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def send(url, agent_type, client_id, timeout):
+    body = json.dumps({"agent_type": agent_type, "query": QUERIES[agent_type]}).encode()
+    req = urllib.request.Request(
+        f"{url}/api/analyze",
+        data=body,
+        headers={"Content-Type": "application/json", "X-Client-Id": client_id},
+    )
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            resp.read()
+            status, retry_after, reason = resp.status, None, None
+    except urllib.error.HTTPError as e:
+        status, retry_after = e.code, e.headers.get("Retry-After")
+        try:
+            reason = json.loads(e.read()).get("error")
+        except ValueError:
+            reason = None
+    except Exception:
+        status, retry_after, reason = "error", None, None
+    return status, time.perf_counter() - started, retry_after, reason
+
+
+def rejected_by(reason):
+    """Which limiter produced a 429: the per-client rate limiter or a priority lane"""
+    if not reason:
+        return "unknown"
+    return "rate limiter" if reason.startswith("Rate limit") else "lane"
+
+
+def run_load(url, mix, concurrency, clients, timeout):
+    jobs = [agent_type for agent_type, count in mix.items() for _ in range(count)]
+    # Interleave lanes so priorities are exercised under contention
+    random.Random(0).shuffle(jobs)
+
+    statuses = defaultdict(Counter)
+    latencies = defaultdict(list)
+    retry_afters = defaultdict(list)
+    rejections = defaultdict(Counter)
+    lock = threading.Lock()
+    cursor = iter(enumerate(jobs))
+
+    def worker():
+        while True:
+            with lock:
+                item = next(cursor, None)
+            if item is None:
+                return
+            index, agent_type = item
+            status, elapsed, retry_after, reason = send(url, agent_type, f"load-client-{index % clients}", timeout)
+            with lock:
+                statuses[agent_type][status] += 1
+                if status == 200:
+                    latencies[agent_type].append(elapsed)
+                if retry_after:
+                    retry_afters[agent_type].append(int(retry_after))
+                if status == 429:
+                    rejections[agent_type][rejected_by(reason)] += 1
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - started
+
+    print(f"\n📈 LOAD RESULTS ({len(jobs)} requests, {concurrency} concurrent, {wall:.1f}s)")
+    for agent_type in mix:
+        lat = latencies[agent_type]
+        print(f"• {agent_type}: statuses={dict(statuses[agent_type])} "
+              f"p50={percentile(lat, 50) * 1000:.0f}ms p95={percentile(lat, 95) * 1000:.0f}ms "
+              f"retry_after_max={max(retry_afters[agent_type], default=0)}s "
+              f"rejected_by={dict(rejections[agent_type])}")
+
+    try:
+        with urllib.request.urlopen(f"{url}/api/metrics", timeout=timeout) as resp:
+            print("\n📊 SERVER METRICS")
+            print(json.dumps(json.loads(resp.read()), indent=2))
+    except Exception as e:
+        print(f"Metrics unavailable: {e}")
+
+
+def bench_tools(chat_streams, tool_calls, simulations):
+    from tool_executor import monte_carlo_var, tool_executor
+
+    async def chat_stream(delays):
+        # Stands in for token streaming: any delay beyond the 10ms tick is event loop blocking
+        for _ in range(100):
+            started = time.perf_counter()
+            await asyncio.sleep(0.01)
+            delays.append(time.perf_counter() - started - 0.01)
+
+    async def inline_tool():
+        await asyncio.sleep(0)
+        monte_carlo_var(1e9, 0.18, simulations)
+
+    async def pooled_tool():
+        await tool_executor.run(monte_carlo_var, 1e9, 0.18, simulations)
+
+    async def run_mode(tool_call):
+        delays = []
+        started = time.perf_counter()
+        await asyncio.gather(
+            *[chat_stream(delays) for _ in range(chat_streams)],
+            *[tool_call() for _ in range(tool_calls)],
+        )
+        return delays, time.perf_counter() - started
+
+    async def main():
+        # Start the pool before measuring so worker spawn time is not counted
+        await tool_executor.run(monte_carlo_var, 1.0, 0.1, 10)
+        print(f"\n⚙️ TOOL OFFLOAD BENCHMARK ({chat_streams} chat streams, "
+              f"{tool_calls} tool calls x {simulations:,} simulations)")
+        for mode, tool_call in (("inline", inline_tool), ("process pool", pooled_tool)):
+            delays, wall = await run_mode(tool_call)
+            print(f"• {mode}: chat delay p50={percentile(delays, 50) * 1000:.1f}ms "
+                  f"p95={percentile(delays, 95) * 1000:.1f}ms max={max(delays) * 1000:.1f}ms "
+                  f"wall={wall:.2f}s")
+
+    asyncio.run(main())
+    tool_executor.shutdown()
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(","):
+        agent_type, count = part.split("=")
+        if agent_type not in QUERIES:
+            raise argparse.ArgumentTypeError(f"Unknown agent_type: {agent_type}")
+        mix[agent_type] = int(count)
+    return mix
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:5000")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("fraud_detection=20,compliance=60"))
+    parser.add_argument("--concurrency", type=int, default=40)
+    parser.add_argument("--clients", type=int, default=20, help="distinct X-Client-Id values (honoured only from a server's TRUSTED_PROXIES)")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--bench-tools", action="store_true", help="benchmark tool offload in-process")
+    parser.add_argument("--chat-streams", type=int, default=20)
+    parser.add_argument("--tool-calls", type=int, default=4)
+    parser.add_argument("--simulations", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    if args.bench_tools:
+        bench_tools(args.chat_streams, args.tool_calls, args.simulations)
+    else:
+        run_load(args.url, args.mix, args.concurrency, args.clients, args.timeout)
@@ -0,0 +1,39 @@
+"""
+Pydantic output models for the financial AI agents
+Kept in their own module so pydantic is only imported on first use.
+"""
+
+from typing import List
+
+from pydantic import BaseModel
+
+
+class TransactionData(BaseModel):
+    transaction_id: str
+    amount: float
+    merchant: str
+    category: str
+    risk_score: float
+
+class FraudAnalysisReport(BaseModel):
+    analysis_timestamp: str
+    total_transactions_analyzed: int
+    high_risk_transactions: List[TransactionData]
+    fraud_probability: float
+    recommended_actions: List[str]
+    compliance_status: str
+    risk_level: str
+
+class ComplianceReport(BaseModel):
+    regulation_framework: str
+    compliance_score: int
+    violations_detected: List[str]
+    remediation_steps: List[str]
+    audit_trail_complete: bool
+
+class MarketRiskAnalysis(BaseModel):
+    portfolio_value: float
+    value_at_risk: float
+    risk_categories: List[dict]
+    stress_test_results: dict
+    recommendations: List[str]
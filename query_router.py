@@ -0,0 +1,195 @@
+"""
+Query Router - deterministic fast path in front of the agents
+Queries that map directly onto a tool ("Calculate VaR for $2.5B portfolio ...
+18% volatility", "Verify SOX controls: 127 tests, 3 missing audit trails")
+are recognized with compiled patterns and their parameters extracted, so the
+caller can run the tool locally instead of checking out credentials and
+calling Bedrock. Anything not recognized returns None and goes to the agent.
+"""
+
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+_NUMBER = r"(\d[\d,]*(?:\.\d+)?)"
+_SCALE = r"(k|m|mm|b|bn|t|thousand|million|billion|trillion)?"
+_MULTIPLIERS = {
+    "k": 1e3, "thousand": 1e3,
+    "m": 1e6, "mm": 1e6, "million": 1e6,
+    "b": 1e9, "bn": 1e9, "billion": 1e9,
+    "t": 1e12, "trillion": 1e12,
+}
+
+VAR_KEYWORD = re.compile(r"\bvar\b|value[- ]at[- ]risk", re.IGNORECASE)
+MONEY = re.compile(r"\$\s*" + _NUMBER + r"\s*" + _SCALE + r"\b", re.IGNORECASE)
+VOLATILITY = re.compile(r"(\d+(?:\.\d+)?)\s*%\s*(?:annual\s+|daily\s+)?vol(?:atility)?\b", re.IGNORECASE)
+ALLOCATION = re.compile(r"(\d+(?:\.\d+)?)\s*%\s+([a-z][a-z ]*?)\s*(?=,|;|\.|$|\band\b)", re.IGNORECASE)
+
+FRAMEWORK = re.compile(r"\b(SOX|PCI[- ]?DSS|GLBA|AML)\b", re.IGNORECASE)
+PERIOD = re.compile(r"\b(Q[1-4]\s+\d{4}|\d{4}-Q[1-4])\b", re.IGNORECASE)
+REVIEWED = re.compile(_NUMBER + r"\s*" + _SCALE + r"\s+(?:transactions|tests|controls|records)\b", re.IGNORECASE)
+VIOLATIONS = re.compile(
+    _NUMBER + r"\s+(?:(?:SOX|PCI[- ]?DSS|GLBA|AML)\s+)?"
+    r"(violations?|missing audit trails?|exceptions?|failures?|deficienc(?:y|ies))\b",
+    re.IGNORECASE,
+)
+
+ASSET_CLASSES = {
+    "equities": "Equities", "equity": "Equities", "stocks": "Equities",
+    "bonds": "Fixed Income", "bond": "Fixed Income", "fixed income": "Fixed Income",
+    "cash": "Cash", "commodities": "Commodities", "real estate": "Real Estate",
+    "alternatives": "Alternatives", "fx": "FX", "currencies": "FX",
+}
+
+
+# Words a fast-path query may contain besides the parsed terms; anything else
+# (a horizon, a confidence level, a stress scenario, a question) goes to the agent
+VAR_FILLER = {"calculate", "compute", "estimate", "for", "a", "an", "the", "of", "on", "with", "and", "at",
+              "my", "our", "portfolio", "book", "fund"}
+COMPLIANCE_VERBS = {"perform", "run", "verify", "audit", "check", "conduct"}
+COMPLIANCE_FILLER = COMPLIANCE_VERBS | {"compliance", "controls", "control", "audit", "for", "with", "and",
+                                        "of", "the", "a", "an", "in", "on", "across"}
+_WORD = re.compile(r"[^\s,;:.!?()]+")
+
+
+def _amount(number: str, scale: Optional[str]) -> float:
+    return float(number.replace(",", "")) * _MULTIPLIERS.get((scale or "").lower(), 1.0)
+
+
+def _framework_name(text: str) -> str:
+    name = text.upper().replace(" ", "-")
+    return "PCI-DSS" if name.startswith("PCI") else name
+
+
+def _consume(pattern: re.Pattern, text: str) -> Tuple[List[re.Match], str]:
+    """All matches of pattern, and text with the matched spans blanked out"""
+    matches = list(pattern.finditer(text))
+    for match in reversed(matches):
+        text = text[:match.start()] + " " + text[match.end():]
+    return matches, text
+
+
+def _only_filler(text: str, filler: set) -> bool:
+    return all(word.lower() in filler for word in _WORD.findall(text))
+
+
+@dataclass
+class RoutedQuery:
+    route: str          # "value_at_risk", "compliance_status" or "compliance_rollup"
+    params: Dict = field(default_factory=dict)
+
+
+def parse_value_at_risk(query: str) -> Optional[RoutedQuery]:
+    """One VaR keyword, one dollar amount, one volatility and optional allocations of at most 100%"""
+    keywords, rest = _consume(VAR_KEYWORD, query)
+    money, rest = _consume(MONEY, rest)
+    volatility, rest = _consume(VOLATILITY, rest)
+    if not keywords or len(money) != 1 or len(volatility) != 1:
+        return None
+
+    matches, rest = _consume(ALLOCATION, rest)
+    allocations: Dict[str, float] = {}
+    for match in matches:
+        asset_class = ASSET_CLASSES.get(match.group(2).strip().lower())
+        if asset_class is None:
+            return None
+        allocations[asset_class] = allocations.get(asset_class, 0.0) + float(match.group(1)) / 100
+    if sum(allocations.values()) > 1.005:
+        return None
+    if not _only_filler(rest, VAR_FILLER):
+        return None
+
+    return RoutedQuery("value_at_risk", {
+        "portfolio_value": _amount(*money[0].groups()),
+        "volatility": float(volatility[0].group(1)) / 100,
+        "allocations": list(allocations.items()),
+    })
+
+
+def parse_compliance(query: str) -> Optional[RoutedQuery]:
+    """An imperative audit ("Verify ...", "Perform ... audit") of one framework, with
+    reviewed and violation counts, a period, or both"""
+    words = _WORD.findall(query)
+    if not words or words[0].lower() not in COMPLIANCE_VERBS:
+        return None
+
+    violations, rest = _consume(VIOLATIONS, query)
+    reviewed, rest = _consume(REVIEWED, rest)
+    periods, rest = _consume(PERIOD, rest)
+    _, rest = _consume(FRAMEWORK, rest)
+    if len(violations) > 1 or len(reviewed) > 1 or len(periods) > 1 or len(violations) != len(reviewed):
+        return None
+    frameworks = {_framework_name(match.group(1)) for match in FRAMEWORK.finditer(query)}
+    if len(frameworks) > 1 or not _only_filler(rest, COMPLIANCE_FILLER):
+        return None
+
+    framework = frameworks.pop() if frameworks else None
+    period = periods[0].group(1) if periods else None
+    if reviewed:
+        transaction_count = int(_amount(*reviewed[0].groups()))
+        violation_count = int(violations[0].group(1).replace(",", ""))
+        # More violations than items reviewed is not a status the tool can score
+        if violation_count > transaction_count:
+            return None
+        return RoutedQuery("compliance_status", {
+            "regulation_framework": framework or "General",
+            "period": period,
+            "transaction_count": transaction_count,
+            "violations": violation_count,
+            "violation_type": violations[0].group(2).lower(),
+        })
+    if period:
+        return RoutedQuery("compliance_rollup", {
+            "regulation_framework": framework or "ALL",
+            "period": period,
+        })
+    return None
+
+
+PARSERS = {
+    "risk_analysis": parse_value_at_risk,
+    "compliance": parse_compliance,
+}
+
+
+class QueryRouter:
+    """Matches queries to tool routes and tracks hit rate and latency"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.queries = 0
+        self.served: Dict[str, int] = {}
+        self.total_parse = 0.0
+        self.total_served = 0.0
+        self.max_served = 0.0
+
+    def route(self, agent_type: str, query: str) -> Optional[RoutedQuery]:
+        started = time.perf_counter()
+        parser = PARSERS.get(agent_type)
+        routed = parser(query) if parser else None
+        with self._lock:
+            self.queries += 1
+            self.total_parse += time.perf_counter() - started
+        return routed
+
+    def record_served(self, route: str, elapsed: float):
+        with self._lock:
+            self.served[route] = self.served.get(route, 0) + 1
+            self.total_served += elapsed
+            self.max_served = max(self.max_served, elapsed)
+
+    def metrics(self) -> dict:
+        with self._lock:
+            hits = sum(self.served.values())
+            return {
+                'queries': self.queries,
+                'hits': hits,
+                'fallbacks': self.queries - hits,
+                'hit_rate': round(hits / self.queries, 3) if self.queries else 0.0,
+                'served_by_route': dict(self.served),
+                'avg_parse_ms': round(self.total_parse / max(self.queries, 1) * 1000, 3),
+                'avg_served_ms': round(self.total_served / max(hits, 1) * 1000, 2),
+                'max_served_ms': round(self.max_served * 1000, 2),
+            }
@@ -0,0 +1,246 @@
+"""
+Shared State for Multi-Process Deployments
+When the app runs under several worker processes, Britive credential leases
+and cached analysis results live in a backend every worker on the host can
+see, so one checkout serves all workers for the lease period.
+
+FileStateBackend keeps entries as files under /dev/shm (tmpfs shared memory)
+with fcntl file locks; MemoryStateBackend is an in-process key-value
+stand-in for single-process runs.
+"""
+
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, ContextManager, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _default_state_dir() -> str:
+    base = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(base, "finance-ai-state")
+
+
+class StateBackend(ABC):
+    """Key-value store with expiry and a per-key cross-worker lock"""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[dict]:
+        """Return the live value for key, or None if missing or expired"""
+
+    @abstractmethod
+    def set(self, key: str, value: dict, ttl: float):
+        """Store value under key for ttl seconds"""
+
+    @abstractmethod
+    def lock(self, key: str) -> ContextManager:
+        """Context manager holding an exclusive lock on key"""
+
+
+class MemoryStateBackend(StateBackend):
+    def __init__(self):
+        self._entries = {}
+        self._locks = {}
+        self._guard = threading.Lock()
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._guard:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.time():
+                del self._entries[key]
+                entry = None
+        return entry[1] if entry else None
+
+    def set(self, key: str, value: dict, ttl: float):
+        now = time.time()
+        with self._guard:
+            self._entries[key] = (now + ttl, value)
+            if len(self._entries) > 10000:
+                self._entries = {k: e for k, e in self._entries.items() if e[0] > now}
+
+    @contextmanager
+    def lock(self, key: str):
+        with self._guard:
+            key_lock = self._locks.setdefault(key, threading.Lock())
+        with key_lock:
+            yield
+
+
+def _same_file(fd: int, path: str) -> bool:
+    try:
+        return os.path.samestat(os.fstat(fd), os.stat(path))
+    except FileNotFoundError:
+        return False
+
+
+class FileStateBackend(StateBackend):
+    """Entries and their .lock files under one directory; expired files are removed
+    on read and by a sweep run from set() at most every sweep_interval seconds"""
+
+    def __init__(self, root: Optional[str] = None, sweep_interval: float = 300.0):
+        self.root = root or _default_state_dir()
+        self.sweep_interval = sweep_interval
+        self._next_sweep = time.monotonic() + sweep_interval
+        # Entries may hold live credentials: owner-only access
+        os.makedirs(self.root, mode=0o700, exist_ok=True)
+        os.chmod(self.root, 0o700)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, hashlib.sha256(key.encode()).hexdigest())
+
+    def _read(self, path: str) -> Optional[dict]:
+        """Load an entry, deleting it if it has expired"""
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+                if entry["expires_at"] > time.time():
+                    return entry
+                # Unlink only the file we read, not a fresh entry another worker just renamed in
+                if _same_file(f.fileno(), path):
+                    os.unlink(path)
+        except (FileNotFoundError, KeyError, TypeError, ValueError):
+            pass
+        return None
+
+    def get(self, key: str) -> Optional[dict]:
+        entry = self._read(self._path(key))
+        return entry["value"] if entry else None
+
+    def set(self, key: str, value: dict, ttl: float):
+        path = self._path(key)
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump({"expires_at": time.time() + ttl, "value": value}, f)
+        # Atomic rename: readers never see a partially written entry
+        os.replace(tmp_path, path)
+
+        if time.monotonic() >= self._next_sweep:
+            self._next_sweep = time.monotonic() + self.sweep_interval
+            self.sweep()
+
+    @contextmanager
+    def lock(self, key: str):
+        lock_path = f"{self._path(key)}.lock"
+        while True:
+            fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            # A sweep may have removed the lock file while we waited: lock the current one instead
+            if _same_file(fd, lock_path):
+                break
+            os.close(fd)
+        try:
+            yield
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+    def sweep(self) -> int:
+        """Remove expired entries, their idle lock files and abandoned temp files"""
+        removed = 0
+        now = time.time()
+        # Entries first, so a lock file whose entry expires in this pass goes with it
+        for name in sorted(os.listdir(self.root), key=lambda name: name.endswith(".lock")):
+            path = os.path.join(self.root, name)
+            if name.endswith(".lock"):
+                if os.path.exists(path[:-len(".lock")]):
+                    continue
+                try:
+                    fd = os.open(path, os.O_RDWR)
+                except FileNotFoundError:
+                    continue
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    # Held by a worker right now
+                    os.close(fd)
+                    continue
+                if _same_file(fd, path):
+                    os.unlink(path)
+                    removed += 1
+                os.close(fd)
+            elif name.endswith(".tmp"):
+                # Left behind by a worker that died mid-write
+                try:
+                    if os.stat(path).st_mtime < now - self.sweep_interval:
+                        os.unlink(path)
+                        removed += 1
+                except FileNotFoundError:
+                    pass
+            elif self._read(path) is None and not os.path.exists(path):
+                removed += 1
+        if removed:
+            logger.info(f"🧹 Shared state: swept {removed} expired files")
+        return removed
+
+
+def create_backend(kind: str) -> StateBackend:
+    if kind == "memory":
+        return MemoryStateBackend()
+    if kind == "file":
+        return FileStateBackend(os.environ.get("SHARED_STATE_DIR"))
+    raise ValueError(f"Unknown shared state backend: {kind}")
+
+
+def _seconds_until(expiration: Optional[str]) -> Optional[float]:
+    if not expiration:
+        return None
+    expires = datetime.fromisoformat(expiration.replace("Z", "+00:00"))
+    return expires.timestamp() - time.time()
+
+
+class CredentialLeaseCache:
+    """One credential checkout per lease period, shared by every worker"""
+
+    def __init__(self, backend: StateBackend, lease_seconds: float, expiry_margin: float = 60.0):
+        self.backend = backend
+        self.lease_seconds = lease_seconds
+        self.expiry_margin = expiry_margin
+
+    def checkout(self, key: str, fetch: Callable[[], dict]) -> dict:
+        credentials = self.backend.get(key)
+        if credentials is not None:
+            return credentials
+
+        with self.backend.lock(key):
+            # Another worker may have checked out while we waited for the lock
+            credentials = self.backend.get(key)
+            if credentials is not None:
+                return credentials
+
+            credentials = fetch()
+            ttl = self.lease_seconds
+            remaining = _seconds_until(credentials.get("Expiration"))
+            if remaining is not None:
+                ttl = min(ttl, remaining - self.expiry_margin)
+            if ttl > 0:
+                self.backend.set(key, credentials, ttl)
+                logger.info(f"🔑 Britive: Shared lease stored for {ttl:.0f}s")
+            return credentials
+
+
+class ResultCache:
+    """Analysis responses shared across workers for a short TTL"""
+
+    def __init__(self, backend: StateBackend, ttl: float):
+        self.backend = backend
+        self.ttl = ttl
+
+    @staticmethod
+    def key(agent_type: str, query: str) -> str:
+        digest = hashlib.sha256(f"{agent_type}\0{query.strip()}".encode()).hexdigest()
+        return f"result:{digest}"
+
+    def get(self, agent_type: str, query: str) -> Optional[dict]:
+        return self.backend.get(self.key(agent_type, query))
+
+    def set(self, agent_type: str, query: str, result: dict):
+        self.backend.set(self.key(agent_type, query), result, self.ttl)
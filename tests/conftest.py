@@ -0,0 +1,18 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope="session")
+def web_app(tmp_path_factory):
+    """Import the web app from a scratch directory so static/ and rollups/ land there"""
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp("app"))
+    try:
+        import finance_web_app_local
+    finally:
+        os.chdir(cwd)
+    return finance_web_app_local
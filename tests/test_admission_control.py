@@ -0,0 +1,70 @@
+import threading
+import time
+
+import pytest
+
+from admission_control import AdmissionController, AdmissionRejected, ClientRateLimiter, LaneConfig
+
+
+def test_priority_lane_is_served_first():
+    controller = AdmissionController(
+        lanes={"fraud": LaneConfig(0, 1, 8, 5.0), "compliance": LaneConfig(2, 1, 8, 5.0)},
+        max_concurrent=1,
+        default_lane="fraud",
+    )
+    order = []
+
+    def run(lane):
+        with controller.admit(lane):
+            order.append(lane)
+            time.sleep(0.05)
+
+    with controller.admit("compliance"):
+        threads = [threading.Thread(target=run, args=("compliance",))]
+        threads[0].start()
+        time.sleep(0.05)
+        threads.append(threading.Thread(target=run, args=("fraud",)))
+        threads[1].start()
+        time.sleep(0.05)
+    for thread in threads:
+        thread.join()
+
+    assert order == ["fraud", "compliance"]
+
+
+def test_full_queue_is_rejected_with_retry_after():
+    controller = AdmissionController({"compliance": LaneConfig(2, 1, 0, 1.0)}, 1, "compliance")
+    with controller.admit("compliance"):
+        with pytest.raises(AdmissionRejected) as rejected:
+            with controller.admit("compliance"):
+                pass
+    assert rejected.value.retry_after >= 1
+    assert controller.metrics()["lanes"]["compliance"]["rejected"] == 1
+
+
+def test_rate_limit_ignores_client_id_header_from_untrusted_peers(web_app, monkeypatch):
+    monkeypatch.setattr(web_app, "rate_limiter", ClientRateLimiter(rate=0.001, burst=1))
+    monkeypatch.setattr(web_app, "fast_path", lambda *args: _served())
+    client = web_app.app.test_client()
+    body = {"agent_type": "compliance", "query": "Verify SOX controls: 127 tests, 3 missing audit trails"}
+
+    assert client.post("/api/analyze", json=body, headers={"X-Client-Id": "a"}).status_code == 200
+    response = client.post("/api/analyze", json=body, headers={"X-Client-Id": "b"})
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+
+
+def test_rate_limit_trusts_client_id_from_configured_proxy(web_app, monkeypatch):
+    monkeypatch.setattr(web_app, "rate_limiter", ClientRateLimiter(rate=0.001, burst=1))
+    monkeypatch.setattr(web_app, "fast_path", lambda *args: _served())
+    monkeypatch.setattr(web_app, "TRUSTED_PROXIES", {"127.0.0.1"})
+    client = web_app.app.test_client()
+    body = {"agent_type": "compliance", "query": "anything"}
+
+    assert client.post("/api/analyze", json=body, headers={"X-Client-Id": "a"}).status_code == 200
+    assert client.post("/api/analyze", json=body, headers={"X-Client-Id": "b"}).status_code == 200
+    assert client.post("/api/analyze", json=body, headers={"X-Client-Id": "a"}).status_code == 429
+
+
+async def _served():
+    return {"success": True}
@@ -0,0 +1,73 @@
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+COLD_START_BUDGET_MS = 500
+HEAVY_MODULES = ["boto3", "strands", "pydantic", "numpy", "matplotlib"]
+
+
+def test_import_is_fast_and_defers_heavy_dependencies(tmp_path):
+    script = (
+        "import sys, json, finance_web_app_local; "
+        f"print(json.dumps([name for name in {HEAVY_MODULES!r} if name in sys.modules]))"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script],
+        cwd=tmp_path,
+        env=dict(os.environ, PREWARM="0", PYTHONPATH=APP_DIR),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert json.loads(proc.stdout.splitlines()[-1]) == []
+    cumulative_us = next(
+        int(line.split("|")[1])
+        for line in proc.stderr.splitlines()
+        if line.startswith("import time:") and line.split("|")[2].strip() == "finance_web_app_local"
+    )
+    assert cumulative_us / 1000 < COLD_START_BUDGET_MS
+
+
+def test_failed_prewarm_is_not_reported_ready(web_app, monkeypatch):
+    def broken_tools():
+        raise RuntimeError("no Bedrock client")
+
+    monkeypatch.setattr(web_app, "ready", threading.Event())
+    monkeypatch.setattr(web_app, "prewarm_error", None)
+    monkeypatch.setattr(web_app, "agent_tools", broken_tools)
+    web_app.prewarm()
+
+    response = web_app.app.test_client().get("/ready")
+    assert response.status_code == 503
+    assert response.get_json() == {"status": "failed", "error": "RuntimeError: no Bedrock client"}
+
+
+def test_startup_profile_lists_only_the_apps_own_imports(web_app, capsys):
+    assert web_app.profile_startup(budget_ms=10_000) == 0
+    listed = re.findall(r"^\s*[\d.]+ms  (\S+)$", capsys.readouterr().out, re.MULTILINE)
+    assert "flask" in listed
+    assert not {"encodings", "encodings.aliases", "posix", "sitecustomize", "_distutils_hack", "certifi"} & set(listed)
+
+
+def test_forked_worker_starts_its_own_prewarm(web_app, monkeypatch):
+    # As in a worker forked from a preloaded master: the master's pre-warm never ran here
+    warmed = threading.Event()
+
+    def fake_prewarm():
+        warmed.set()
+        web_app.ready.set()
+
+    monkeypatch.setattr(web_app, "PREWARM", True)
+    monkeypatch.setattr(web_app, "ready", threading.Event())
+    monkeypatch.setattr(web_app, "prewarm_started_pid", os.getpid() + 1)
+    monkeypatch.setattr(web_app, "prewarm", fake_prewarm)
+    client = web_app.app.test_client()
+
+    client.get("/ready")
+    assert warmed.wait(5)
+    assert client.get("/ready").status_code == 200
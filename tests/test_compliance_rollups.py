@@ -0,0 +1,68 @@
+import multiprocessing
+
+import pytest
+
+from compliance_rollups import ComplianceRollupStore
+
+
+def _ingest_worker(root, batches):
+    store = ComplianceRollupStore(root)
+    for _ in range(batches):
+        store.ingest([{"date": "2025-07-01", "framework": "SOX", "transactions": 1}])
+
+
+def test_concurrent_worker_ingests_lose_no_updates(tmp_path):
+    context = multiprocessing.get_context("spawn")
+    workers = [context.Process(target=_ingest_worker, args=(str(tmp_path), 20)) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+        assert worker.exitcode == 0
+
+    report = ComplianceRollupStore(str(tmp_path)).report("SOX", "2025-07")
+    assert report["transactions_reviewed"] == 80
+
+
+@pytest.mark.parametrize("record", [
+    {"framework": "SOX"},
+    {"date": "not-a-date"},
+    {"date": "2025-07-01", "transactions": 1, "violations": 3},
+    "not-an-object",
+])
+def test_invalid_records_are_rejected_before_writing(tmp_path, record):
+    store = ComplianceRollupStore(str(tmp_path))
+    with pytest.raises(ValueError):
+        store.ingest([{"date": "2025-07-02", "framework": "SOX"}, record])
+    assert store.report("ALL", "2025-07")["transactions_reviewed"] == 0
+
+
+def test_audit_trail_coverage_is_per_framework(tmp_path):
+    store = ComplianceRollupStore(str(tmp_path))
+    store.ingest([{"date": f"2025-07-{day:02d}", "framework": "PCI-DSS"} for day in range(1, 32)])
+    store.ingest([{"date": "2025-07-01", "framework": "SOX"}])
+
+    assert store.report("PCI-DSS", "2025-07")["audit_trail_complete"]
+    assert store.report("ALL", "2025-07")["audit_trail_complete"]
+    assert not store.report("SOX", "2025-07")["audit_trail_complete"]
+
+
+def test_quarter_report_merges_month_partitions(tmp_path):
+    store = ComplianceRollupStore(str(tmp_path))
+    store.ingest([
+        {"date": "2025-07-05", "framework": "PCI-DSS", "rule": "3.4", "transactions": 1000, "violations": 2},
+        {"date": "2025-09-30", "framework": "PCI-DSS", "rule": "3.4", "transactions": 500, "violations": 1},
+    ])
+    report = store.report("PCI-DSS", "Q3 2025")
+    assert report["transactions_reviewed"] == 1500
+    assert report["violations"] == 3
+    assert report["violations_detected"] == ["PCI-DSS 3.4 (unassigned): 3 violations in 1,500 transactions"]
+
+
+def test_reversed_period_is_rejected(tmp_path, web_app):
+    store = ComplianceRollupStore(str(tmp_path))
+    with pytest.raises(ValueError):
+        store.report("SOX", "2025-09-01..2025-07-01")
+
+    response = web_app.app.test_client().get("/api/compliance/report?framework=SOX&period=2025-09-01..2025-07-01")
+    assert response.status_code == 400
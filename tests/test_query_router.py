@@ -0,0 +1,74 @@
+import pytest
+
+from load_driver import QUERIES
+from query_router import PARSERS, parse_compliance, parse_value_at_risk
+
+
+@pytest.mark.parametrize("query", [
+    "Calculate 99% 10-day VaR for $2.5B portfolio under a 2008 crisis stress scenario",
+    "Is our VaR on the $5M desk acceptable given last week's limit breach?",
+    "Calculate VaR for $1B portfolio",
+    "Calculate 10-day VaR for $1B portfolio with 18% volatility",
+    "Calculate VaR for $1B portfolio: 80% equities, 50% bonds, 18% volatility",
+    "Calculate VaR for $1B portfolio: 60% equities, 40% crypto, 18% volatility",
+])
+def test_value_at_risk_outside_the_grammar_goes_to_the_agent(query):
+    assert parse_value_at_risk(query) is None
+
+
+def test_value_at_risk_grammar():
+    routed = parse_value_at_risk("Calculate VaR for $2.5B portfolio: 60% equities, 40% bonds, 18% volatility")
+    assert routed.params == {
+        "portfolio_value": 2.5e9,
+        "volatility": 0.18,
+        "allocations": [("Equities", 0.6), ("Fixed Income", 0.4)],
+    }
+
+
+@pytest.mark.parametrize("query", [
+    "Why did we have 3 violations out of 127 tests last year and who is responsible?",
+    "Verify SOX controls: 127 tests, 300 violations",
+    "Verify SOX controls: 127 tests, 3 missing audit trails, and explain the root cause",
+    "Verify SOX and GLBA controls: 127 tests, 3 violations",
+    "Q3 2025 PCI-DSS audit",
+])
+def test_compliance_outside_the_grammar_goes_to_the_agent(query):
+    assert parse_compliance(query) is None
+
+
+def test_compliance_status_keeps_the_period():
+    routed = parse_compliance("Perform Q3 2025 compliance audit for 1.2M transactions with 5 PCI-DSS violations")
+    assert routed.route == "compliance_status"
+    assert routed.params["regulation_framework"] == "PCI-DSS"
+    assert routed.params["period"] == "Q3 2025"
+    assert routed.params["transaction_count"] == 1_200_000
+
+
+def test_ui_example_routes_with_an_unallocated_position(web_app):
+    client = web_app.app.test_client()
+    query = "Calculate VaR for $2.5B portfolio: 60% equities, 30% bonds, 18% volatility"
+    assert query in web_app.HTML_TEMPLATE
+    data = client.post("/api/analyze", json={"agent_type": "risk_analysis", "query": query}).get_json()
+
+    assert data["fast_path"]
+    rows = {row["type"]: row for row in data["structured_data"]["risk_categories"]}
+    assert set(rows) == {"Equities", "Fixed Income", "Unallocated"}
+    assert rows["Unallocated"]["exposure"] == pytest.approx(2.5e8)
+    assert sum(row["component_var"] for row in rows.values()) == pytest.approx(2.5e9 * 0.18 * 1.645, rel=1e-3)
+
+
+@pytest.mark.parametrize("agent_type", ["compliance", "risk_analysis"])
+def test_load_driver_queries_reach_admission_control(agent_type):
+    assert PARSERS[agent_type](QUERIES[agent_type]) is None
+
+
+def test_fast_path_attribution_adds_up_to_the_reported_var(web_app):
+    client = web_app.app.test_client()
+    for query in ("Calculate VaR for $1B portfolio: 60% equities, 40% bonds, 18% volatility",
+                  "Calculate VaR for $1B portfolio with 18% volatility"):
+        response = client.post("/api/analyze", json={"agent_type": "risk_analysis", "query": query})
+        data = response.get_json()["structured_data"]
+
+        assert data["value_at_risk"] == pytest.approx(1e9 * 0.18 * 1.645)
+        assert sum(row["component_var"] for row in data["risk_categories"]) == pytest.approx(data["value_at_risk"], rel=1e-3)
+        assert all(row["type"] != "Cash" for row in data["risk_categories"])
@@ -0,0 +1,90 @@
+import time
+from statistics import NormalDist
+
+import numpy as np
+import pytest
+
+from risk_attribution import RiskAttributionEngine, engine_from_positions
+
+Z = NormalDist().inv_cdf(0.95)
+
+
+@pytest.fixture
+def book():
+    rng = np.random.default_rng(7)
+    n = 12
+    root = rng.normal(size=(n, n)) * 0.05
+    covariance = root @ root.T + np.diag(rng.uniform(0.001, 0.01, n))
+    exposures = rng.uniform(-1e6, 5e6, n)
+    categories = ["Equities", "Fixed Income", "Commodities"] * 4
+    return exposures, categories, covariance
+
+
+def brute_force_var(exposures, covariance):
+    return Z * np.sqrt(exposures @ covariance @ exposures)
+
+
+def test_portfolio_var_and_components_match_dense_covariance(book):
+    exposures, categories, covariance = book
+    engine = RiskAttributionEngine(exposures, categories, covariance=covariance)
+
+    assert engine.portfolio_var() == pytest.approx(brute_force_var(exposures, covariance))
+    assert engine.component_var().sum() == pytest.approx(engine.portfolio_var())
+
+
+def test_incremental_var_per_position_and_category(book):
+    exposures, categories, covariance = book
+    engine = RiskAttributionEngine(exposures, categories, covariance=covariance)
+    total = brute_force_var(exposures, covariance)
+
+    for i, incremental in enumerate(engine.incremental_var()):
+        without = exposures.copy()
+        without[i] = 0
+        assert incremental == pytest.approx(total - brute_force_var(without, covariance))
+
+    for row in engine.category_breakdown():
+        without = np.where(np.asarray(categories) == row["category"], 0.0, exposures)
+        assert row["incremental_var"] == pytest.approx(total - brute_force_var(without, covariance))
+
+
+def test_update_position_matches_a_full_rebuild(book):
+    exposures, categories, covariance = book
+    engine = RiskAttributionEngine(exposures, categories, covariance=covariance)
+    engine.update_position(3, -2.5e6)
+
+    exposures = exposures.copy()
+    exposures[3] = -2.5e6
+    rebuilt = RiskAttributionEngine(exposures, categories, covariance=covariance)
+    assert engine.portfolio_var() == pytest.approx(rebuilt.portfolio_var())
+    np.testing.assert_allclose(engine.component_var(), rebuilt.component_var())
+    np.testing.assert_allclose(engine.incremental_var(), rebuilt.incremental_var())
+
+
+def test_factor_form_builds_a_large_book():
+    rng = np.random.default_rng(0)
+    n, k = 50_000, 40
+    factor_root = rng.normal(size=(k, k)) * 0.02
+    started = time.perf_counter()
+    engine = RiskAttributionEngine(
+        exposures=rng.uniform(1e4, 1e6, n),
+        categories=rng.choice(["Equities", "Fixed Income", "FX", "Commodities"], n),
+        factor_loadings=rng.normal(size=(n, k)),
+        factor_covariance=factor_root @ factor_root.T + np.eye(k) * 1e-4,
+        specific_variance=rng.uniform(1e-4, 1e-3, n),
+    )
+    engine.category_breakdown()
+    assert time.perf_counter() - started < 2.0
+    assert engine.component_var().sum() == pytest.approx(engine.portfolio_var())
+
+
+def test_positions_with_covariance_use_the_dense_form(book):
+    exposures, categories, covariance = book
+    positions = [{"category": c, "value": v} for c, v in zip(categories, exposures)]
+    engine = engine_from_positions(positions, covariance=covariance.tolist())
+    assert engine.portfolio_var() == pytest.approx(brute_force_var(exposures, covariance))
+
+
+def test_malformed_correlation_key_is_rejected():
+    positions = [{"category": "equities", "value": 1e6, "volatility": 0.2}]
+    with pytest.raises(ValueError, match="two categories"):
+        engine_from_positions(positions, {"ab": 0.5})
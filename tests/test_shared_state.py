@@ -0,0 +1,75 @@
+import multiprocessing
+import os
+import time
+
+import pytest
+
+from shared_state import CredentialLeaseCache, FileStateBackend, StateBackend
+
+
+def _checkout_worker(root, counter, start):
+    def fetch():
+        with open(counter, "a") as f:
+            f.write("x")
+        time.sleep(0.2)
+        return {"AccessKeyId": "AKIA-TEST"}
+
+    start.wait()
+    cache = CredentialLeaseCache(FileStateBackend(root), lease_seconds=600)
+    assert cache.checkout("britive:tenant:profile", fetch)["AccessKeyId"] == "AKIA-TEST"
+
+
+def test_workers_share_one_credential_checkout(tmp_path):
+    context = multiprocessing.get_context("spawn")
+    counter = str(tmp_path / "fetches")
+    start = context.Event()
+    workers = [
+        context.Process(target=_checkout_worker, args=(str(tmp_path / "state"), counter, start))
+        for _ in range(6)
+    ]
+    for worker in workers:
+        worker.start()
+    start.set()
+    for worker in workers:
+        worker.join()
+        assert worker.exitcode == 0
+
+    with open(counter) as f:
+        assert f.read() == "x"
+
+
+def test_expired_entries_are_deleted_on_read(tmp_path):
+    backend = FileStateBackend(str(tmp_path))
+    backend.set("result:a", {"answer": 1}, ttl=0.05)
+    assert backend.get("result:a") == {"answer": 1}
+
+    time.sleep(0.1)
+    assert backend.get("result:a") is None
+    assert os.listdir(tmp_path) == []
+
+
+def test_sweep_removes_expired_entries_and_idle_locks(tmp_path):
+    backend = FileStateBackend(str(tmp_path))
+    for key in ("expired", "held"):
+        with backend.lock(key):
+            backend.set(key, {}, ttl=0.05)
+    backend.set("live", {}, ttl=600)
+    time.sleep(0.1)
+
+    with backend.lock("held"):
+        backend.sweep()
+        assert sorted(os.listdir(tmp_path)) == sorted([
+            os.path.basename(backend._path("live")),
+            os.path.basename(backend._path("held")) + ".lock",
+        ])
+    assert backend.get("live") == {}
+
+
+def test_state_backend_is_abstract():
+    with pytest.raises(TypeError):
+        StateBackend()
+
+
+def test_app_creates_no_backend_unless_configured(web_app):
+    assert web_app.shared_state is None
+    assert web_app.lease_cache is None and web_app.result_cache is None
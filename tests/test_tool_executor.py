@@ -0,0 +1,27 @@
+import asyncio
+
+import pytest
+
+from tool_executor import ToolExecutor, monte_carlo_var
+
+
+def test_timeout_leaves_the_pool_and_concurrent_calls_running():
+    executor = ToolExecutor(max_workers=2)
+
+    async def main():
+        # Start the pool first so worker spawn time does not count against the timeouts
+        await executor.run(monte_carlo_var, 1.0, 0.1, 10)
+        pool = executor._pool
+        abandoned = executor.run(monte_carlo_var, 1e9, 0.18, 1_500_000, timeout=0.3)
+        survivor = executor.run(monte_carlo_var, 1e9, 0.18, 1_000_000, 0.95, 7, timeout=30.0)
+        results = await asyncio.gather(abandoned, survivor, return_exceptions=True)
+        return pool, results
+
+    try:
+        pool, (abandoned, survivor) = asyncio.run(main())
+        assert executor._pool is pool
+    finally:
+        executor.shutdown()
+
+    assert isinstance(abandoned, TimeoutError)
+    assert survivor == pytest.approx(monte_carlo_var(1e9, 0.18, 1_000_000, 0.95, 7))
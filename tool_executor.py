@@ -0,0 +1,153 @@
+"""
+Tool Execution Layer
+CPU-heavy tool kernels marked with @offload run in a process pool so they do
+not block the agent event loop or hold the GIL against other requests.
+Large numeric inputs travel through shared memory instead of being pickled,
+and every offloaded call has a timeout and is abandoned with its request.
+"""
+
+import asyncio
+import atexit
+import logging
+import math
+import multiprocessing
+import random
+import threading
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from typing import Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Inputs below these sizes run inline; the round trip to a worker costs more than it saves
+OFFLOAD_MIN_TRANSACTIONS = 50_000
+OFFLOAD_MIN_SIMULATIONS = 100_000
+MAX_SIMULATIONS = 5_000_000
+
+
+def offload(timeout: float):
+    """Mark a module-level kernel as safe to run in the process pool"""
+    def decorator(func):
+        func.offload_timeout = timeout
+        return func
+    return decorator
+
+
+class SharedArray:
+    """float64 values in a shared memory block; pickles as the block name only"""
+
+    def __init__(self, shm: shared_memory.SharedMemory, length: int, owner: bool):
+        self.shm = shm
+        self.length = length
+        self.owner = owner
+
+    @classmethod
+    def create(cls, values: Iterable[float]) -> "SharedArray":
+        data = array("d", values)
+        shm = shared_memory.SharedMemory(create=True, size=max(data.itemsize * len(data), 1))
+        shm.buf[:data.itemsize * len(data)] = data.tobytes()
+        return cls(shm, len(data), owner=True)
+
+    def __reduce__(self):
+        return (_attach_shared_array, (self.shm.name, self.length))
+
+    def __len__(self):
+        return self.length
+
+    def values(self) -> memoryview:
+        return self.shm.buf[:self.length * 8].cast("d")
+
+    def close(self):
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+def _attach_shared_array(name: str, length: int) -> SharedArray:
+    return SharedArray(shared_memory.SharedMemory(name=name), length, owner=False)
+
+
+# Kernels: pure functions of their arguments so they can run in any worker
+@offload(timeout=15.0)
+def scan_high_risk(risk_scores: SharedArray, amounts: SharedArray, threshold: float, limit: int = 5) -> dict:
+    scores, values = risk_scores.values(), amounts.values()
+    try:
+        count, flagged_amount, first = 0, 0.0, []
+        for i in range(len(risk_scores)):
+            if scores[i] > threshold:
+                count += 1
+                flagged_amount += values[i]
+                if len(first) < limit:
+                    first.append(i)
+        return {'count': count, 'flagged_amount': flagged_amount, 'first_indices': first}
+    finally:
+        scores.release()
+        values.release()
+        if not risk_scores.owner:
+            risk_scores.close()
+            amounts.close()
+
+
+@offload(timeout=30.0)
+def monte_carlo_var(portfolio_value: float, volatility: float, simulations: int,
+                    confidence: float = 0.95, seed: Optional[int] = None) -> float:
+    rng = random.Random(seed)
+    losses = sorted(-portfolio_value * rng.gauss(0.0, volatility) for _ in range(simulations))
+    return losses[min(simulations - 1, math.ceil(simulations * confidence) - 1)]
+
+
+class ToolExecutor:
+    """Runs offloaded kernels in a lazily started process pool"""
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # spawn: forking a multi-threaded web server is unsafe
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._pool
+
+    def _discard(self, pool: ProcessPoolExecutor):
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+
+    async def run(self, kernel, *args, timeout: Optional[float] = None):
+        """Run kernel in the pool. A call that times out or is cancelled is dropped if it has
+        not started; once running it is left to finish on its worker, since killing a worker
+        breaks the pool for every other call. Kernels bound their own work (MAX_SIMULATIONS)."""
+        timeout = timeout or kernel.offload_timeout
+        pool = self._get_pool()
+        future = pool.submit(kernel, *args)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except BrokenProcessPool:
+            # A worker died (e.g. out of memory); the next call starts a fresh pool
+            self._discard(pool)
+            raise
+        except asyncio.TimeoutError:
+            if not future.cancel():
+                logger.warning(f"⏱️ Tool executor: {kernel.__name__} timed out, leaving it to finish on its worker")
+            raise TimeoutError(f"{kernel.__name__} exceeded {timeout:g}s timeout")
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+
+    def shutdown(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+tool_executor = ToolExecutor()
+atexit.register(tool_executor.shutdown)